@@ -6,9 +6,14 @@ Handles flexible input formats and provides clear feedback
 
 import os
 import sys
+import shutil
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Copy buffer for ZIP extraction (1 MiB)
+EXTRACT_BUFFER_SIZE = 1024 * 1024
+
 def check_file_exists(filepath, description):
     """Check if file exists and report"""
     if os.path.exists(filepath):
@@ -19,6 +24,19 @@ def check_file_exists(filepath, description):
         print(f"  [FAIL] {description}: NOT FOUND - {filepath}")
         return False
 
+def extract_zip_member(zip_ref, info, output_dir):
+    """Stream a single ZIP member to disk with a large copy buffer"""
+    target = (output_dir / info.filename).resolve()
+
+    # Skip entries that would land outside the output directory
+    if output_dir.resolve() not in target.parents:
+        print(f"  [WARN] Skipping unsafe path in ZIP: {info.filename}")
+        return
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with zip_ref.open(info) as zin, open(target, 'wb') as fout:
+        shutil.copyfileobj(zin, fout, length=EXTRACT_BUFFER_SIZE)
+
 def extract_boundaries_zip(zip_path, output_dir):
     """Extract boundaries ZIP file"""
     print(f"\n2. Extracting boundaries ZIP...")
@@ -26,7 +44,11 @@ def extract_boundaries_zip(zip_path, output_dir):
     output_dir.mkdir(parents=True, exist_ok=True)
 
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(output_dir)
+        members = [info for info in zip_ref.infolist() if not info.is_dir()]
+
+        # Members are read through separate handles, so they can be inflated in parallel
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda info: extract_zip_member(zip_ref, info, output_dir), members))
 
     # Find the shapefile
     shp_files = list(output_dir.glob("**/*.shp"))
@@ -38,6 +60,15 @@ def extract_boundaries_zip(zip_path, output_dir):
         print(f"  [FAIL] No .shp file found after extraction")
         return None
 
+def read_csv_arrow(csv_path):
+    """Read a CSV with the multithreaded PyArrow parser, falling back to pandas' C parser"""
+    import pandas as pd
+
+    try:
+        return pd.read_csv(csv_path, engine='pyarrow', dtype_backend='pyarrow')
+    except ImportError:
+        return pd.read_csv(csv_path)
+
 def validate_facilities_csv(csv_path):
     """Validate facilities CSV and check columns"""
     try:
@@ -48,7 +79,7 @@ def validate_facilities_csv(csv_path):
 
     print(f"\n3. Validating facilities CSV...")
 
-    df = pd.read_csv(csv_path)
+    df = read_csv_arrow(csv_path)
     print(f"  [OK] Loaded {len(df)} facilities")
     print(f"  Columns: {list(df.columns)}")
 
@@ -4,8 +4,41 @@ Convert projected coordinates to WGS84 lat/long
 Handles facilities CSV with projected coordinates
 """
 
+import importlib.util
+import os
 import pandas as pd
 import sys
+from functools import lru_cache
+
+try:
+    from _utm_numba import utm_to_wgs84, utm_zone
+except ImportError:
+    utm_to_wgs84 = None
+
+# Skip PROJ network grid lookups - no grid-shift files are needed for Togo
+os.environ.setdefault("PROJ_NETWORK", "OFF")
+
+# Togo area of interest (west, south, east, north in degrees)
+TOGO_BOUNDS = (-1, 5, 3, 12)
+
+@lru_cache(maxsize=32)
+def get_transformer(source_epsg, target_epsg=4326):
+    """
+    Get a cached transformer between two EPSG codes
+
+    Args:
+        source_epsg: Source EPSG code
+        target_epsg: Target EPSG code (default 4326 = WGS84)
+    """
+    from pyproj import Transformer
+    from pyproj.transformer import AreaOfInterest
+
+    return Transformer.from_crs(
+        f"EPSG:{source_epsg}",
+        f"EPSG:{target_epsg}",
+        always_xy=True,
+        area_of_interest=AreaOfInterest(*TOGO_BOUNDS)
+    )
 
 def convert_projected_to_latlon(csv_path, source_epsg=32631):
     """
@@ -15,27 +48,36 @@ def convert_projected_to_latlon(csv_path, source_epsg=32631):
         csv_path: Path to CSV with projected coordinates
         source_epsg: Source EPSG code (default 32631 = UTM Zone 31N for Togo)
     """
-    try:
-        from pyproj import Transformer
-    except ImportError:
+    # Use the Numba UTM kernel for WGS84 UTM zones, pyproj otherwise
+    utm = utm_zone(source_epsg) if utm_to_wgs84 is not None else None
+
+    if utm is None and importlib.util.find_spec('pyproj') is None:
         print("[ERROR] pyproj not installed. Install with: pip install pyproj")
         sys.exit(1)
 
-    # Read CSV
-    df = pd.read_csv(csv_path)
+    # Read CSV with the PyArrow parser when available
+    try:
+        df = pd.read_csv(csv_path, engine='pyarrow', dtype_backend='pyarrow')
+    except ImportError:
+        df = pd.read_csv(csv_path)
 
     print(f"Original data:")
     print(f"  Longitude range: {df['longitude'].min():.2f} to {df['longitude'].max():.2f}")
     print(f"  Latitude range: {df['latitude'].min():.2f} to {df['latitude'].max():.2f}")
 
-    # Create transformer (from projected to WGS84)
-    transformer = Transformer.from_crs(f"EPSG:{source_epsg}", "EPSG:4326", always_xy=True)
-
     # Transform coordinates
-    lon_latlong, lat_latlong = transformer.transform(
-        df['longitude'].values,
-        df['latitude'].values
-    )
+    if utm is not None:
+        lon_latlong, lat_latlong = utm_to_wgs84(
+            df['longitude'].to_numpy(dtype=float),
+            df['latitude'].to_numpy(dtype=float),
+            *utm
+        )
+    else:
+        transformer = get_transformer(source_epsg)
+        lon_latlong, lat_latlong = transformer.transform(
+            df['longitude'].to_numpy(dtype=float),
+            df['latitude'].to_numpy(dtype=float)
+        )
 
     # Create new dataframe with converted coordinates
     df_converted = df.copy()
@@ -6,8 +6,10 @@ Generate H3 hexagonal grids for a district polygon
 import sys
 import geopandas as gpd
 import h3
-from shapely.geometry import Polygon
-import json
+import numpy as np
+import shapely
+from shapely.geometry import mapping
+from _grid_io import write_grids
 
 def generate_h3_grids(district_geojson, resolution=8):
     """
@@ -21,7 +23,7 @@ def generate_h3_grids(district_geojson, resolution=8):
         GeoDataFrame with hexagonal grids
     """
     # Read district
-    district = gpd.read_file(district_geojson)
+    district = gpd.read_file(district_geojson, engine='pyogrio')
 
     # Ensure WGS84 (required for H3)
     if district.crs != "EPSG:4326":
@@ -30,26 +32,27 @@ def generate_h3_grids(district_geojson, resolution=8):
     # Get the first geometry
     geom = district.geometry.iloc[0]
 
-    # Convert to GeoJSON format for h3
-    geojson_geom = json.loads(gpd.GeoSeries([geom]).to_json())['features'][0]['geometry']
+    # Convert to GeoJSON-like mapping for h3
+    geojson_geom = mapping(geom)
 
     # Generate H3 hexagons
     print(f"Generating H3 hexagons at resolution {resolution}...")
-    hexagons = list(h3.polyfill_geojson(geojson_geom, resolution))
+    hex_ids = list(h3.geo_to_cells(geojson_geom, resolution))
 
-    print(f"Generated {len(hexagons)} hexagons")
+    print(f"Generated {len(hex_ids)} hexagons")
 
-    # Create geometries from H3 IDs
-    hex_geometries = []
-    hex_ids = []
+    # Get boundary coordinates (lat, lon pairs) for every hexagon. Pentagons and
+    # distorted cells have a different vertex count, so pad each ring with its
+    # first vertex to build one (N, max_vertices, 2) array
+    boundaries = [h3.cell_to_boundary(hex_id) for hex_id in hex_ids]
+    max_vertices = max((len(boundary) for boundary in boundaries), default=6)
+    coords = np.array([
+        boundary + (boundary[0],) * (max_vertices - len(boundary))
+        for boundary in boundaries
+    ]).reshape(len(hex_ids), max_vertices, 2)
 
-    for hex_id in hexagons:
-        # Get boundary coordinates (lat, lon pairs)
-        boundary = h3.h3_to_geo_boundary(hex_id, geo_json=True)
-        # Create polygon (note: h3 returns lon, lat so we need to reverse)
-        poly = Polygon(boundary)
-        hex_geometries.append(poly)
-        hex_ids.append(hex_id)
+    # Create all polygons in one call (note: h3 returns lat, lon so we need to reverse)
+    hex_geometries = shapely.polygons(coords[:, :, ::-1])
 
     # Create GeoDataFrame
     grids = gpd.GeoDataFrame({
@@ -57,16 +60,17 @@ def generate_h3_grids(district_geojson, resolution=8):
         'geometry': hex_geometries
     }, crs="EPSG:4326")
 
-    # Calculate centroid for each grid
-    grids['centroid_lat'] = grids.geometry.centroid.y
-    grids['centroid_lon'] = grids.geometry.centroid.x
+    # Use the H3 cell centers as grid centroids
+    centers = np.array([h3.cell_to_latlng(hex_id) for hex_id in hex_ids]).reshape(len(hex_ids), 2)
+    grids['centroid_lat'] = centers[:, 0]
+    grids['centroid_lon'] = centers[:, 1]
 
     return grids
 
 
 if __name__ == "__main__":
     if len(sys.argv) < 3:
-        print("Usage: python 02_generate_grids.py <district_geojson> <output_geojson> [resolution]")
+        print("Usage: python 02_generate_grids.py <district_geojson> <output_grids> [resolution]")
         sys.exit(1)
 
     district_file = sys.argv[1]
@@ -77,5 +81,5 @@ if __name__ == "__main__":
     grids = generate_h3_grids(district_file, resolution)
 
     # Save
-    grids.to_file(output_file, driver='GeoJSON')
+    write_grids(grids, output_file)
     print(f"Saved {len(grids)} grids to {output_file}")
\ No newline at end of file
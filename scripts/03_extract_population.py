@@ -4,24 +4,81 @@ Extract population values from raster for each hexagonal grid
 """
 
 import sys
-import geopandas as gpd
 import rasterio
-from rasterio.mask import mask
+from rasterio.features import rasterize
+from rasterio.windows import Window, from_bounds, bounds as window_bounds
+from shapely.geometry import box
 import numpy as np
+from _grid_io import read_grids, write_grids
 
-def extract_population(grids_geojson, population_tif):
+# Approximate number of raster rows decoded per strip
+STRIP_ROWS = 2048
+
+def grid_window(src, bounds):
+    """
+    Get the raster window covering the given bounds, clipped to the raster
+
+    Args:
+        src: Open rasterio dataset
+        bounds: (minx, miny, maxx, maxy) in the raster CRS
+
+    Returns:
+        Window, or None if the bounds do not overlap the raster
+    """
+    window = from_bounds(*bounds, transform=src.transform)
+
+    # Expand to whole pixels so edge cells are fully covered
+    col_start = int(np.floor(window.col_off))
+    row_start = int(np.floor(window.row_off))
+    col_stop = int(np.ceil(window.col_off + window.width))
+    row_stop = int(np.ceil(window.row_off + window.height))
+
+    col_start, row_start = max(col_start, 0), max(row_start, 0)
+    col_stop, row_stop = min(col_stop, src.width), min(row_stop, src.height)
+
+    if col_stop <= col_start or row_stop <= row_start:
+        return None
+
+    return Window(col_start, row_start, col_stop - col_start, row_stop - row_start)
+
+
+def block_strips(src, window):
+    """
+    Split a window into full-width row strips aligned to the raster's blocks
+
+    Each internal tile is decoded once while the strip bounds memory use.
+
+    Args:
+        src: Open rasterio dataset
+        window: Window to split
+
+    Yields:
+        Window for each strip
+    """
+    block_rows = src.block_shapes[0][0]
+    strip_rows = max(block_rows, STRIP_ROWS // block_rows * block_rows)
+
+    row = window.row_off
+    row_stop = window.row_off + window.height
+    while row < row_stop:
+        next_row = min((row // strip_rows + 1) * strip_rows, row_stop)
+        yield Window(window.col_off, row, window.width, next_row - row)
+        row = next_row
+
+
+def extract_population(grids_file, population_tif):
     """
     Extract population from raster for each grid polygon
 
     Args:
-        grids_geojson: Path to grids GeoJSON file
+        grids_file: Path to grids file (GeoParquet or GeoJSON)
         population_tif: Path to population raster (TIF)
 
     Returns:
         GeoDataFrame with population column added
     """
-    print(f"Reading grids from {grids_geojson}...")
-    grids = gpd.read_file(grids_geojson)
+    print(f"Reading grids from {grids_file}...")
+    grids = read_grids(grids_file)
 
     print(f"Reading population raster from {population_tif}...")
     with rasterio.open(population_tif) as src:
@@ -33,33 +90,47 @@ def extract_population(grids_geojson, population_tif):
             print(f"Reprojecting grids from {grids.crs} to {src.crs}...")
             grids = grids.to_crs(src.crs)
 
-        # Extract population for each grid
-        populations = []
-
+        # Read the raster window covering all grids, one block-aligned strip at a time
+        # (an empty grid file has NaN bounds and no window)
+        window = grid_window(src, grids.total_bounds) if not grids.empty else None
         print(f"Extracting population for {len(grids)} grids...")
-        for idx, row in grids.iterrows():
-            if (idx + 1) % 100 == 0:
-                print(f"  Processed {idx + 1}/{len(grids)} grids...")
-
-            try:
-                # Mask raster with grid polygon
-                out_image, out_transform = mask(src, [row.geometry], crop=True, nodata=src.nodata)
-
-                # Sum population in grid (handle nodata values)
-                valid_data = out_image[0]  # First band
-
-                if src.nodata is not None:
-                    valid_data = valid_data[valid_data != src.nodata]
-
-                # Only sum positive values
-                valid_data = valid_data[valid_data > 0]
-
-                pop = np.sum(valid_data) if len(valid_data) > 0 else 0
-                populations.append(float(pop))
 
-            except Exception as e:
-                print(f"  Warning: Could not extract population for grid {idx}: {e}")
-                populations.append(0)
+        if grids.empty:
+            populations = np.zeros(0)
+        elif window is None:
+            print("  Warning: Grids do not overlap the population raster")
+            populations = np.zeros(len(grids))
+        else:
+            geometries = grids.geometry.values
+            populations = np.zeros(len(grids) + 1)
+
+            for strip in block_strips(src, window):
+                # Only read and rasterize strips that grids touch
+                candidates = grids.sindex.query(box(*window_bounds(strip, src.transform)))
+                if len(candidates) == 0:
+                    continue
+
+                # Nodata is masked and filled with 0; negative/NaN cells also count as 0
+                data = src.read(1, window=strip, masked=True, out_dtype='float32').filled(0)
+                data[~(data > 0)] = 0
+
+                # Label each pixel with the (1-based) index of the grid covering it
+                labels = rasterize(
+                    ((geometries[i], i + 1) for i in candidates),
+                    out_shape=data.shape,
+                    transform=src.window_transform(strip),
+                    fill=0,
+                    dtype='int32'
+                )
+
+                # Sum population per grid label in one pass
+                populations += np.bincount(
+                    labels.ravel(),
+                    weights=data.ravel(),
+                    minlength=len(grids) + 1
+                )
+
+            populations = populations[1:]
 
         grids['population'] = populations
 
@@ -76,7 +147,7 @@ def extract_population(grids_geojson, population_tif):
 
 if __name__ == "__main__":
     if len(sys.argv) < 4:
-        print("Usage: python 03_extract_population.py <grids_geojson> <population_tif> <output_geojson>")
+        print("Usage: python 03_extract_population.py <grids_file> <population_tif> <output_file>")
         sys.exit(1)
 
     grids_file = sys.argv[1]
@@ -87,5 +158,5 @@ if __name__ == "__main__":
     grids_with_pop = extract_population(grids_file, pop_tif)
 
     # Save
-    grids_with_pop.to_file(output_file, driver='GeoJSON')
+    write_grids(grids_with_pop, output_file)
     print(f"Saved results to {output_file}")
\ No newline at end of file
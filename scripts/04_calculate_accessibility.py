@@ -4,16 +4,44 @@ Assign grids to nearest facilities and calculate routing distances using OSRM
 """
 
 import sys
-import geopandas as gpd
 import pandas as pd
 import numpy as np
 from scipy.spatial import cKDTree
-import requests
-import time
+import asyncio
+import aiohttp
+from _grid_io import read_grids, write_grids
+
+EARTH_RADIUS_KM = 6371.0
+
+# Distance bands (km) for population coverage columns
+DISTANCE_BANDS_KM = (5, 10, 20)
+
+# Retries when a pooled keep-alive connection was dropped by OSRM
+OSRM_RETRIES = 2
+
+
+def latlon_to_unit_vectors(lat, lon):
+    """
+    Convert lat/lon in degrees to 3D unit vectors on the sphere
+
+    Args:
+        lat: Array of latitudes
+        lon: Array of longitudes
+
+    Returns:
+        (N, 3) array of x, y, z coordinates
+    """
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.column_stack([
+        np.cos(lat) * np.cos(lon),
+        np.cos(lat) * np.sin(lon),
+        np.sin(lat)
+    ])
+
 
 def assign_grids_to_facilities(grids, facilities):
     """
-    Assign each grid to its nearest facility using KDTree
+    Assign each grid to its nearest facility by great-circle distance
 
     Args:
         grids: GeoDataFrame with grid polygons
@@ -24,25 +52,23 @@ def assign_grids_to_facilities(grids, facilities):
     """
     print(f"Assigning {len(grids)} grids to {len(facilities)} facilities...")
 
-    # Get grid centroids
-    grid_coords = np.array([[row['centroid_lat'], row['centroid_lon']]
-                            for _, row in grids.iterrows()])
-
-    # Get facility coordinates
-    facility_coords = facilities[['latitude', 'longitude']].values
+    # Get grid centroids and facility coordinates
+    grid_coords = grids[['centroid_lat', 'centroid_lon']].to_numpy()
+    facility_coords = facilities[['latitude', 'longitude']].to_numpy()
 
-    # Build KDTree for nearest neighbor search
-    tree = cKDTree(facility_coords)
+    # Build KDTree on the unit sphere: the nearest chord is the nearest great circle
+    tree = cKDTree(latlon_to_unit_vectors(facility_coords[:, 0], facility_coords[:, 1]))
 
     # Find nearest facility for each grid
-    distances, indices = tree.query(grid_coords)
+    chords, indices = tree.query(latlon_to_unit_vectors(grid_coords[:, 0], grid_coords[:, 1]))
 
     # Assign facilities to grids
-    grids['assigned_facility'] = facilities.iloc[indices]['name'].values
-    grids['assigned_facility_id'] = facilities.iloc[indices].index.values
+    nearest = facilities.iloc[indices]
+    grids['assigned_facility'] = nearest['name'].to_numpy()
+    grids['assigned_facility_id'] = nearest.index.to_numpy()
     grids['assigned_facility_lat'] = facility_coords[indices, 0]
     grids['assigned_facility_lon'] = facility_coords[indices, 1]
-    grids['straight_line_distance_km'] = distances * 111  # Rough conversion to km
+    grids['straight_line_distance_km'] = 2 * np.arcsin(np.clip(chords / 2, 0, 1)) * EARTH_RADIUS_KM
 
     print(f"Assignment complete!")
     print(f"Facilities assigned: {grids['assigned_facility'].nunique()}")
@@ -50,15 +76,85 @@ def assign_grids_to_facilities(grids, facilities):
     return grids
 
 
-def calculate_osrm_distances(grids, osrm_host='localhost', osrm_port=5000, batch_size=100):
+async def fetch_osrm_table(session, base_url, sources, destination, retries=OSRM_RETRIES):
+    """
+    Query the OSRM table service for routes from many sources to one destination
+
+    Args:
+        session: aiohttp.ClientSession used for the request
+        base_url: OSRM server URL (http://host:port)
+        sources: Array of (lon, lat) source coordinates
+        destination: (lon, lat) destination coordinate
+        retries: Number of retries on connection errors
+
+    Returns:
+        Arrays of distances (km) and durations (minutes), NaN where no route was found
+    """
+    # OSRM expects lon,lat format; the destination is the last coordinate
+    coords = ';'.join(f"{lon},{lat}" for lon, lat in sources)
+    coords += f";{destination[0]},{destination[1]}"
+    n_sources = len(sources)
+
+    url = (f"{base_url}/table/v1/driving/{coords}"
+           f"?sources={';'.join(str(i) for i in range(n_sources))}"
+           f"&destinations={n_sources}&annotations=distance,duration")
+
+    for attempt in range(retries + 1):
+        try:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                data = await response.json(content_type=None)
+            break
+        except aiohttp.ClientConnectionError:
+            # Reused connections may have been closed by OSRM's keep-alive timeout
+            if attempt == retries:
+                raise
+
+    if data['code'] != 'Ok':
+        raise ValueError(f"OSRM returned {data['code']}: {data.get('message', '')}")
+
+    # Distance in meters, duration in seconds (null where unroutable)
+    distances_m = np.array(data['distances'], dtype=float)[:, 0]
+    durations_s = np.array(data['durations'], dtype=float)[:, 0]
+
+    return distances_m / 1000, durations_s / 60
+
+
+async def fetch_osrm_tables(base_url, origins, destinations, chunks, max_connections=64):
+    """
+    Fetch OSRM tables for all chunks concurrently over keep-alive connections
+
+    Args:
+        base_url: OSRM server URL (http://host:port)
+        origins: Array of (lon, lat) grid centroids
+        destinations: Array of (lon, lat) assigned facility locations
+        chunks: List of grid position arrays sharing one facility
+        max_connections: Maximum concurrent connections to OSRM
+
+    Returns:
+        List of (distances_km, durations_min) tuples or exceptions, one per chunk
+    """
+    connector = aiohttp.TCPConnector(limit=max_connections, keepalive_timeout=60)
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=60)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        return await asyncio.gather(
+            *(fetch_osrm_table(session, base_url, origins[positions], destinations[positions[0]])
+              for positions in chunks),
+            return_exceptions=True
+        )
+
+
+def calculate_osrm_distances(grids, osrm_host='localhost', osrm_port=5000, batch_size=100, max_connections=64):
     """
-    Calculate actual routing distances using OSRM
+    Calculate actual routing distances using the OSRM table service
 
     Args:
         grids: GeoDataFrame with assigned facilities
         osrm_host: OSRM server host
         osrm_port: OSRM server port
-        batch_size: Number of routes to calculate per request
+        batch_size: Maximum locations per table request (OSRM's default --max-table-size is 100)
+        max_connections: Maximum concurrent table requests
 
     Returns:
         grids with route distances and travel times
@@ -66,58 +162,51 @@ def calculate_osrm_distances(grids, osrm_host='localhost', osrm_port=5000, batch
     print(f"Calculating OSRM routes...")
     print(f"OSRM endpoint: http://{osrm_host}:{osrm_port}")
 
-    route_distances = []
-    route_durations = []
+    base_url = f"http://{osrm_host}:{osrm_port}"
 
-    # Process in batches to avoid overwhelming OSRM
-    total = len(grids)
+    origins = grids[['centroid_lon', 'centroid_lat']].to_numpy()
+    destinations = grids[['assigned_facility_lon', 'assigned_facility_lat']].to_numpy()
 
-    for idx, row in grids.iterrows():
-        if (idx + 1) % 50 == 0:
-            print(f"  Processed {idx + 1}/{total} routes...")
+    # Default to straight line distance, assuming 30 km/h
+    route_distances = grids['straight_line_distance_km'].to_numpy(dtype=float).copy()
+    route_durations = route_distances / 0.5
 
-        origin_lon = row['centroid_lon']
-        origin_lat = row['centroid_lat']
-        dest_lon = row['assigned_facility_lon']
-        dest_lat = row['assigned_facility_lat']
+    # One table request per facility per chunk of served grids
+    # (the facility itself takes one of the batch_size locations)
+    chunk_size = max(batch_size - 1, 1)
+    chunks = []
+    for positions in grids.groupby('assigned_facility_id').indices.values():
+        for start in range(0, len(positions), chunk_size):
+            chunks.append(positions[start:start + chunk_size])
 
-        # OSRM expects lon,lat format
-        url = f"http://{osrm_host}:{osrm_port}/route/v1/driving/{origin_lon},{origin_lat};{dest_lon},{dest_lat}?overview=false"
+    print(f"  Requesting {len(chunks)} OSRM tables for {len(grids)} grids...")
 
-        try:
-            response = requests.get(url, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-
-                if data['code'] == 'Ok' and len(data['routes']) > 0:
-                    # Distance in meters, duration in seconds
-                    distance_m = data['routes'][0]['distance']
-                    duration_s = data['routes'][0]['duration']
-
-                    route_distances.append(distance_m / 1000)  # Convert to km
-                    route_durations.append(duration_s / 60)    # Convert to minutes
-                else:
-                    # No route found, use straight line distance
-                    route_distances.append(row['straight_line_distance_km'])
-                    route_durations.append(row['straight_line_distance_km'] / 0.5)  # Assume 30 km/h
-            else:
-                # OSRM error, use straight line
-                route_distances.append(row['straight_line_distance_km'])
-                route_durations.append(row['straight_line_distance_km'] / 0.5)
-
-        except Exception as e:
-            print(f"  Warning: OSRM request failed for grid {idx}: {e}")
-            # Fallback to straight line distance
-            route_distances.append(row['straight_line_distance_km'])
-            route_durations.append(row['straight_line_distance_km'] / 0.5)
-
-        # Small delay to avoid overwhelming OSRM
-        time.sleep(0.01)
+    results = asyncio.run(
+        fetch_osrm_tables(base_url, origins, destinations, chunks, max_connections)
+    )
+
+    for positions, result in zip(chunks, results):
+        if isinstance(result, Exception):
+            # Fallback to straight line distance for the whole chunk
+            print(f"  Warning: OSRM table request failed for {len(positions)} grids: {result}")
+            continue
+
+        # No route found, keep straight line distance
+        distances_km, durations_min = result
+        routed = ~np.isnan(distances_km) & ~np.isnan(durations_min)
+        route_distances[positions[routed]] = distances_km[routed]
+        route_durations[positions[routed]] = durations_min[routed]
 
     grids['route_distance_km'] = route_distances
     grids['travel_time_min'] = route_durations
 
+    # Per-grid population terms so metrics reduce to plain sums
+    if 'population' in grids.columns:
+        population = grids['population'].fillna(0)
+        grids['pw_dist'] = grids['route_distance_km'] * population
+        for band in DISTANCE_BANDS_KM:
+            grids[f'in{band}'] = population.where(grids['route_distance_km'] <= band, 0)
+
     print(f"Route calculation complete!")
     print(f"Average route distance: {np.mean(route_distances):.2f} km")
     print(f"Average travel time: {np.mean(route_durations):.2f} minutes")
@@ -127,8 +216,8 @@ def calculate_osrm_distances(grids, osrm_host='localhost', osrm_port=5000, batch
 
 if __name__ == "__main__":
     if len(sys.argv) < 5:
-        print("Usage: python 04_calculate_accessibility.py <grids_geojson> <facilities_csv> <output_geojson> <osrm_host> [osrm_port]")
-        print("Example: python 04_calculate_accessibility.py grids.geojson facilities.csv output.geojson localhost 5000")
+        print("Usage: python 04_calculate_accessibility.py <grids_file> <facilities_csv> <output_file> <osrm_host> [osrm_port]")
+        print("Example: python 04_calculate_accessibility.py grids.parquet facilities.csv output.parquet localhost 5000")
         sys.exit(1)
 
     grids_file = sys.argv[1]
@@ -139,7 +228,7 @@ if __name__ == "__main__":
 
     # Load data
     print(f"Loading grids from {grids_file}...")
-    grids = gpd.read_file(grids_file)
+    grids = read_grids(grids_file)
 
     print(f"Loading facilities from {facilities_file}...")
     facilities = pd.read_csv(facilities_file)
@@ -165,5 +254,5 @@ if __name__ == "__main__":
         grids = calculate_osrm_distances(grids, osrm_host, osrm_port)
 
     # Save results
-    grids.to_file(output_file, driver='GeoJSON')
+    write_grids(grids, output_file)
     print(f"Saved results to {output_file}")
\ No newline at end of file
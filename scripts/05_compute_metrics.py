@@ -4,16 +4,16 @@ Compute facility-level accessibility metrics including population-weighted dista
 """
 
 import sys
-import geopandas as gpd
 import pandas as pd
 import numpy as np
+from _grid_io import read_grids
 
-def compute_facility_metrics(grids_geojson, district_name):
+def compute_facility_metrics(grids_file, district_name):
     """
     Compute metrics per facility
 
     Args:
-        grids_geojson: Path to grids with accessibility data
+        grids_file: Path to grids with accessibility data
         district_name: Name of the district
 
     Returns:
@@ -22,7 +22,7 @@ def compute_facility_metrics(grids_geojson, district_name):
     print(f"Computing metrics for {district_name}...")
 
     # Load grids
-    grids = gpd.read_file(grids_geojson)
+    grids = read_grids(grids_file)
 
     # Check if we have assignments
     if 'assigned_facility' not in grids.columns or grids['assigned_facility'].isna().all():
@@ -42,86 +42,79 @@ def compute_facility_metrics(grids_geojson, district_name):
             'pop_within_20km': [0]
         })
 
+    # Per-grid population terms so every metric is a plain sum. Script 04 writes
+    # pw_dist/in5/in10/in20; compute them here for grids from older runs
+    distances = grids['route_distance_km']
+    population = grids['population'].fillna(0) if 'population' in grids.columns else pd.Series(0.0, index=grids.index)
+    if 'pw_dist' not in grids.columns:
+        grids['pw_dist'] = distances * population
+        for band in (5, 10, 20):
+            grids[f'in{band}'] = population.where(distances <= band, 0)
+
+    per_grid = pd.DataFrame({
+        'assigned_facility': grids['assigned_facility'],
+        'route_distance_km': distances,
+        'population': population,
+        'pop_distance': grids['pw_dist'],
+        'pop_within_5km': grids['in5'],
+        'pop_within_10km': grids['in10'],
+        'pop_within_20km': grids['in20'],
+    })
+
     # Group by facility
-    metrics_list = []
-
-    for facility_name in grids['assigned_facility'].unique():
-        if pd.isna(facility_name):
-            continue
-
-        # Get grids for this facility
-        facility_grids = grids[grids['assigned_facility'] == facility_name].copy()
-
-        # Calculate metrics
-        total_grids = len(facility_grids)
-        total_pop = facility_grids['population'].sum() if 'population' in facility_grids.columns else 0
-
-        # Distance statistics
-        distances = facility_grids['route_distance_km'].values
-        mean_dist = np.mean(distances)
-        median_dist = np.median(distances)
-        min_dist = np.min(distances)
-        max_dist = np.max(distances)
-
-        # Population-weighted distance
-        if 'population' in facility_grids.columns and total_pop > 0:
-            pop_weighted_dist = np.average(
-                distances,
-                weights=facility_grids['population']
-            )
-        else:
-            pop_weighted_dist = mean_dist
-
-        # Population within distance bands
-        pop_within_5km = facility_grids[facility_grids['route_distance_km'] <= 5]['population'].sum() if 'population' in facility_grids.columns else 0
-        pop_within_10km = facility_grids[facility_grids['route_distance_km'] <= 10]['population'].sum() if 'population' in facility_grids.columns else 0
-        pop_within_20km = facility_grids[facility_grids['route_distance_km'] <= 20]['population'].sum() if 'population' in facility_grids.columns else 0
-
-        metrics = {
-            'district': district_name,
-            'facility_name': facility_name,
-            'total_grids_served': total_grids,
-            'population_served': total_pop,
-            'mean_distance_km': mean_dist,
-            'median_distance_km': median_dist,
-            'min_distance_km': min_dist,
-            'max_distance_km': max_dist,
-            'pop_weighted_distance_km': pop_weighted_dist,
-            'pop_within_5km': pop_within_5km,
-            'pop_within_10km': pop_within_10km,
-            'pop_within_20km': pop_within_20km,
-            'percent_within_5km': (pop_within_5km / total_pop * 100) if total_pop > 0 else 0,
-            'percent_within_10km': (pop_within_10km / total_pop * 100) if total_pop > 0 else 0,
-        }
-
-        metrics_list.append(metrics)
-
-        print(f"  {facility_name}:")
-        print(f"    Population served: {total_pop:,.0f}")
-        print(f"    Pop-weighted distance: {pop_weighted_dist:.2f} km")
+    agg = per_grid.groupby('assigned_facility', sort=False).agg(
+        total_grids_served=('route_distance_km', 'size'),
+        population_served=('population', 'sum'),
+        mean_distance_km=('route_distance_km', 'mean'),
+        median_distance_km=('route_distance_km', 'median'),
+        min_distance_km=('route_distance_km', 'min'),
+        max_distance_km=('route_distance_km', 'max'),
+        pop_distance=('pop_distance', 'sum'),
+        pop_within_5km=('pop_within_5km', 'sum'),
+        pop_within_10km=('pop_within_10km', 'sum'),
+        pop_within_20km=('pop_within_20km', 'sum'),
+    )
+
+    # Population-weighted distance (mean distance where no population)
+    has_pop = agg['population_served'] > 0
+    served = agg['population_served'].where(has_pop)
+    agg['pop_weighted_distance_km'] = (agg['pop_distance'] / served).where(has_pop, agg['mean_distance_km'])
+    agg['percent_within_5km'] = (agg['pop_within_5km'] / served * 100).fillna(0)
+    agg['percent_within_10km'] = (agg['pop_within_10km'] / served * 100).fillna(0)
+
+    for row in agg.itertuples():
+        print(f"  {row.Index}:")
+        print(f"    Population served: {row.population_served:,.0f}")
+        print(f"    Pop-weighted distance: {row.pop_weighted_distance_km:.2f} km")
 
     # Create DataFrame
-    metrics_df = pd.DataFrame(metrics_list)
+    metrics_df = agg.rename_axis('facility_name').reset_index()
+    metrics_df.insert(0, 'district', district_name)
+    metrics_df = metrics_df[[
+        'district', 'facility_name', 'total_grids_served', 'population_served',
+        'mean_distance_km', 'median_distance_km', 'min_distance_km', 'max_distance_km',
+        'pop_weighted_distance_km', 'pop_within_5km', 'pop_within_10km', 'pop_within_20km',
+        'percent_within_5km', 'percent_within_10km'
+    ]]
 
     # Add district-level summary
+    totals = per_grid[['population', 'pop_distance', 'pop_within_5km', 'pop_within_10km', 'pop_within_20km']].sum()
+    total_pop = totals['population']
     district_summary = {
         'district': district_name,
         'facility_name': 'DISTRICT_TOTAL',
         'total_grids_served': len(grids),
-        'population_served': grids['population'].sum() if 'population' in grids.columns else 0,
-        'mean_distance_km': grids['route_distance_km'].mean(),
-        'median_distance_km': grids['route_distance_km'].median(),
-        'min_distance_km': grids['route_distance_km'].min(),
-        'max_distance_km': grids['route_distance_km'].max(),
-        'pop_weighted_distance_km': np.average(
-            grids['route_distance_km'],
-            weights=grids['population']
-        ) if 'population' in grids.columns and grids['population'].sum() > 0 else grids['route_distance_km'].mean(),
-        'pop_within_5km': grids[grids['route_distance_km'] <= 5]['population'].sum() if 'population' in grids.columns else 0,
-        'pop_within_10km': grids[grids['route_distance_km'] <= 10]['population'].sum() if 'population' in grids.columns else 0,
-        'pop_within_20km': grids[grids['route_distance_km'] <= 20]['population'].sum() if 'population' in grids.columns else 0,
-        'percent_within_5km': (grids[grids['route_distance_km'] <= 5]['population'].sum() / grids['population'].sum() * 100) if 'population' in grids.columns and grids['population'].sum() > 0 else 0,
-        'percent_within_10km': (grids[grids['route_distance_km'] <= 10]['population'].sum() / grids['population'].sum() * 100) if 'population' in grids.columns and grids['population'].sum() > 0 else 0,
+        'population_served': total_pop,
+        'mean_distance_km': distances.mean(),
+        'median_distance_km': distances.median(),
+        'min_distance_km': distances.min(),
+        'max_distance_km': distances.max(),
+        'pop_weighted_distance_km': totals['pop_distance'] / total_pop if total_pop > 0 else distances.mean(),
+        'pop_within_5km': totals['pop_within_5km'],
+        'pop_within_10km': totals['pop_within_10km'],
+        'pop_within_20km': totals['pop_within_20km'],
+        'percent_within_5km': totals['pop_within_5km'] / total_pop * 100 if total_pop > 0 else 0,
+        'percent_within_10km': totals['pop_within_10km'] / total_pop * 100 if total_pop > 0 else 0,
     }
 
     metrics_df = pd.concat([metrics_df, pd.DataFrame([district_summary])], ignore_index=True)
@@ -131,7 +124,7 @@ def compute_facility_metrics(grids_geojson, district_name):
 
 if __name__ == "__main__":
     if len(sys.argv) < 4:
-        print("Usage: python 05_compute_metrics.py <grids_geojson> <district_name> <output_csv>")
+        print("Usage: python 05_compute_metrics.py <grids_file> <district_name> <output_csv>")
         sys.exit(1)
 
     grids_file = sys.argv[1]
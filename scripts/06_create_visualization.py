@@ -1,111 +1,429 @@
 #!/usr/bin/env python3
 """
 Create visualization maps for spatial accessibility analysis
+
+Each map function closes its figure and collects garbage before returning.
+When mapping many districts, run one process per district (as the workflow
+does) so GEOS geometry memory is returned to the OS when the process exits.
+
+Set MAP_CACHE_DIR to keep rasterized grid fills between runs. Re-rendering
+the same input (e.g. while tuning styles) then skips rasterization.
 """
 
+import gc
+import hashlib
+import os
 import sys
-import geopandas as gpd
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive: maps are only written to files
 import matplotlib.pyplot as plt
+plt.rcParams['figure.max_open_warning'] = 0  # Figures are closed explicitly
 import matplotlib.patches as mpatches
+from matplotlib.collections import PolyCollection
 from matplotlib.colors import ListedColormap
 import numpy as np
+import shapely
+from pyproj import Transformer
+from rasterio.features import rasterize
+from rasterio.transform import from_bounds
+from _grid_io import read_grids
+
+# Grid attributes used by the maps
+MAP_COLUMNS = [
+    'assigned_facility',
+    'assigned_facility_lat',
+    'assigned_facility_lon',
+    'route_distance_km',
+    'population'
+]
+
+# Most facilities listed in the catchment legend, and entries per legend column
+LEGEND_MAX_FACILITIES = 50
+LEGEND_ROWS = 25
+
+# Grid count from which polygon fills are rasterized instead of drawn as patches
+RASTERIZE_MIN_GRIDS = 10000
+
+# Width in pixels of rasterized grid images
+RASTER_WIDTH = 2000
+
+# Grid count from which grid outlines are no longer drawn
+EDGE_MAX_GRIDS = 2000
+
+# Width in inches of one map panel, and the default resolution maps are saved at
+MAP_WIDTH_IN = 10
+SAVE_DPI = 150
+
+# zlib level for PNG output: fast encoding over a slightly smaller file
+PNG_COMPRESS_LEVEL = 1
+
+def simplify_for_display(grids, dpi=SAVE_DPI):
+    """
+    Drop grid polygon vertices that would be closer than half a pixel on the map
+
+    Args:
+        grids: GeoDataFrame with grid polygons
+        dpi: Resolution the maps are saved at
+
+    Returns:
+        grids with simplified geometries
+    """
+    minx, _, maxx, _ = grids.total_bounds
+    tolerance = (maxx - minx) / (MAP_WIDTH_IN * dpi * 2)
+
+    # Keep topology so cells smaller than the tolerance do not collapse to empty
+    grids['geometry'] = grids.geometry.simplify(tolerance, preserve_topology=True)
+
+    return grids
+
+def parse_viewport(text):
+    """
+    Parse a 'minx,miny,maxx,maxy' viewport argument
+
+    Args:
+        text: Comma separated viewport bounds
+
+    Returns:
+        (minx, miny, maxx, maxy) tuple, or None if the bounds are malformed or empty
+    """
+    try:
+        bbox = tuple(float(v) for v in text.split(','))
+    except ValueError:
+        return None
+
+    if len(bbox) != 4 or not (bbox[0] < bbox[2] and bbox[1] < bbox[3]):
+        return None
+    return bbox
+
+def cull_to_viewport(grids, bbox):
+    """
+    Keep only grids that intersect the map viewport
+
+    Args:
+        grids: GeoDataFrame with grid polygons
+        bbox: (minx, miny, maxx, maxy) viewport in the grids' CRS
+
+    Returns:
+        Grids intersecting the viewport
+    """
+    positions = grids.sindex.query(shapely.box(*bbox), predicate='intersects')
+    return grids.iloc[np.sort(positions)]
+
+def project_to_utm(grids, bbox=None):
+    """
+    Project geographic grids once to their local UTM zone, so maps are drawn in metres
+
+    Args:
+        grids: GeoDataFrame with grid polygons
+        bbox: Optional (minx, miny, maxx, maxy) viewport in the grids' CRS
+
+    Returns:
+        Projected grids and the viewport in the projected CRS
+    """
+    if grids.crs is None or not grids.crs.is_geographic:
+        return grids, bbox
+
+    source_crs = grids.crs
+    grids = grids.to_crs(grids.estimate_utm_crs())
+
+    if bbox is not None:
+        transformer = Transformer.from_crs(source_crs, grids.crs, always_xy=True)
+        bbox = transformer.transform_bounds(*bbox)
+
+    return grids, bbox
+
+def lonlat_to_map(crs, lon, lat):
+    """Transform WGS84 lon/lat arrays into the map CRS"""
+    if crs is None or crs.is_geographic:
+        return lon, lat
+    return Transformer.from_crs('EPSG:4326', crs, always_xy=True).transform(lon, lat)
+
+def axis_labels(crs):
+    """Axis labels for maps drawn in the given CRS"""
+    if crs is None or crs.is_geographic:
+        return 'Longitude', 'Latitude'
+    return 'Easting (m)', 'Northing (m)'
+
+def set_viewport(ax, bbox):
+    """Limit the axes to the viewport, if one was given"""
+    if bbox is not None:
+        ax.set_xlim(bbox[0], bbox[2])
+        ax.set_ylim(bbox[1], bbox[3])
+
+def grid_edge_style(grids):
+    """Grid outline style: thin black edges, or none once outlines would be noise"""
+    if len(grids) < EDGE_MAX_GRIDS:
+        return {'edgecolor': 'black', 'linewidth': 0.3}
+    return {'edgecolor': 'none', 'linewidth': 0}
+
+def grid_polygon_vertices(geometries):
+    """
+    Extract exterior ring vertices of every grid polygon in one pass
+
+    Args:
+        geometries: Array of grid (multi)polygons
+
+    Returns:
+        List of (n_vertices, 2) arrays, and the grid position of each
+    """
+    parts, grid_index = shapely.get_parts(geometries, return_index=True)
+    rings = shapely.get_exterior_ring(parts)
+
+    # Empty rings contribute no coordinates and would shift the split
+    present = ~shapely.is_empty(rings)
+    rings, grid_index = rings[present], grid_index[present]
+
+    coords, ring_index = shapely.get_coordinates(rings, return_index=True)
+    polygons = np.split(coords, np.flatnonzero(np.diff(ring_index)) + 1)
+
+    return polygons, grid_index
+
+def map_aspect(grids):
+    """Axes aspect GeoPandas uses: stretch latitude for geographic coordinates"""
+    if grids.crs is not None and grids.crs.is_geographic:
+        miny, maxy = grids.total_bounds[[1, 3]]
+        return 1 / np.cos(np.radians((miny + maxy) / 2))
+    return 'equal'
+
+def rasterize_grid_values(grids, values, width=RASTER_WIDTH):
+    """
+    Burn per-grid values into an image covering the grids
+
+    Args:
+        grids: GeoDataFrame with grid polygons
+        values: Array of values, one per grid
+        width: Image width in pixels
+
+    Returns:
+        Image array (NaN outside grids) and its (left, right, bottom, top) extent
+    """
+    minx, miny, maxx, maxy = grids.total_bounds
+    height = max(1, int(round(width * (maxy - miny) / (maxx - minx))))
+
+    image = rasterize(
+        zip(grids.geometry.values, values),
+        out_shape=(height, width),
+        transform=from_bounds(minx, miny, maxx, maxy, width, height),
+        fill=np.nan,
+        dtype='float32'
+    )
+
+    return image, (minx, maxx, miny, maxy)
 
-def create_accessibility_map(grids_geojson, output_png, district_name, facility_type='facility'):
+def file_digest(path):
+    """SHA-1 hex digest of a file's contents, read in blocks"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cached_rasterize_grid_values(grids, values, cache_file=None):
+    """
+    Rasterize grid values, reusing an image saved by an earlier run if available
+
+    Args:
+        grids: GeoDataFrame with grid polygons
+        values: Array of values, one per grid
+        cache_file: Optional .npy path to load the image from or save it to
+
+    Returns:
+        Image array (NaN outside grids) and its (left, right, bottom, top) extent
+    """
+    if cache_file is not None and os.path.exists(cache_file):
+        minx, miny, maxx, maxy = grids.total_bounds
+        return np.load(cache_file), (minx, maxx, miny, maxy)
+
+    image, extent = rasterize_grid_values(grids, values)
+
+    if cache_file is not None:
+        # Write then rename, so a concurrent run never loads a partial file
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp.npy"
+        np.save(tmp_file, image)
+        os.replace(tmp_file, cache_file)
+
+    return image, extent
+
+def plot_grid_values(fig, ax, grids, column, cmap, label, vertices=None, raster_cache=None):
+    """
+    Shade grids by a numeric column, rasterizing the fills for large grid counts
+
+    Args:
+        fig: Figure holding the axes
+        ax: Axes to draw on
+        grids: GeoDataFrame with grid polygons
+        column: Column to shade by
+        cmap: Colormap name
+        label: Colorbar label
+        vertices: Precomputed grid_polygon_vertices of the grids, if available
+        raster_cache: Optional path prefix for cached rasterized images
+    """
+    values = grids[column].to_numpy(dtype=float)
+
+    if len(grids) < RASTERIZE_MIN_GRIDS:
+        if vertices is None:
+            vertices = grid_polygon_vertices(grids.geometry.values)
+        polygons, grid_index = vertices
+
+        # Grids without a value are left unplotted
+        keep = ~np.isnan(values[grid_index])
+
+        mappable = PolyCollection(
+            [polygon for polygon, k in zip(polygons, keep) if k],
+            array=values[grid_index[keep]],
+            cmap=cmap,
+            rasterized=True,  # Vector outputs embed the fills as one image
+            **grid_edge_style(grids)
+        )
+        ax.add_collection(mappable)
+        ax.autoscale_view()
+        ax.set_aspect(map_aspect(grids))
+    else:
+        cache_file = None
+        if raster_cache is not None:
+            cache_file = f"{raster_cache}_{column}_{RASTER_WIDTH}.npy"
+
+        image, extent = cached_rasterize_grid_values(grids, values, cache_file)
+        mappable = ax.imshow(image, extent=extent, cmap=cmap, aspect=map_aspect(grids),
+                             interpolation='nearest')
+
+    fig.colorbar(mappable, ax=ax, label=label, orientation='horizontal', pad=0.05)
+
+# Loaded grids and vertices, set before forking map workers so they inherit
+# them instead of receiving pickled copies
+_worker_data = {}
+
+def _run_map(map_function, *args, **kwargs):
+    """Run a map function in a forked worker on the grids inherited from the parent"""
+    map_function(_worker_data['grids'], *args, vertices=_worker_data['vertices'], **kwargs)
+
+def create_accessibility_map(grids, output_png, district_name, facility_type='facility', dpi=SAVE_DPI,
+                             vertices=None, bbox=None, raster_cache=None):
     """
     Create a map showing grids colored by assigned facility and shaded by distance
 
     Args:
-        grids_geojson: Path to grids with accessibility data
+        grids: GeoDataFrame with accessibility data
         output_png: Output PNG file path
         district_name: Name of the district
         facility_type: Type of facility (for title)
+        dpi: Output resolution
+        vertices: Precomputed grid_polygon_vertices of the grids, if available
+        bbox: Optional (minx, miny, maxx, maxy) viewport to zoom both maps to
+        raster_cache: Optional path prefix for cached rasterized images
     """
     print(f"Creating visualization for {district_name}...")
 
-    # Load grids
-    grids = gpd.read_file(grids_geojson)
-
     # Create figure with two subplots
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 10))
 
+    # Facility locations, one row per assigned facility, shared by both maps
+    facility_points = None
+    if 'assigned_facility_lat' in grids.columns:
+        # Names can repeat across facilities, so the location is part of the key
+        facility_points = grids.groupby(
+            ['assigned_facility', 'assigned_facility_lat', 'assigned_facility_lon'],
+            sort=False, observed=True, as_index=False
+        ).size()
+
+        # Facility coordinates are stored as lon/lat; bring them into the map CRS
+        facility_points['x'], facility_points['y'] = lonlat_to_map(
+            grids.crs,
+            facility_points['assigned_facility_lon'].to_numpy(),
+            facility_points['assigned_facility_lat'].to_numpy()
+        )
+
+        # When zoomed, only facilities inside the viewport get a marker
+        if bbox is not None:
+            tree = shapely.STRtree(shapely.points(facility_points['x'], facility_points['y']))
+            facility_points = facility_points.iloc[np.sort(tree.query(shapely.box(*bbox)))]
+    x_label, y_label = axis_labels(grids.crs)
+
     # MAP 1: Colored by facility assignment
     # Get unique facilities and assign colors
-    if 'assigned_facility' in grids.columns and not grids['assigned_facility'].isna().all():
-        facilities = grids['assigned_facility'].dropna().unique()
-        n_facilities = len(facilities)
+    if 'assigned_facility' in grids.columns and grids['assigned_facility'].notna().any():
+        assigned_grids = grids.dropna(subset=['assigned_facility'])
+
+        # GeoPandas colors a categorical column by its integer codes,
+        # so color i belongs to category i
+        assigned_grids = assigned_grids.assign(
+            assigned_facility=assigned_grids['assigned_facility'].astype('category').cat.remove_unused_categories()
+        )
+        facilities = assigned_grids['assigned_facility'].cat.categories
 
         # Create color map
-        colors = plt.cm.tab20(np.linspace(0, 1, n_facilities))
-        facility_colors = {facility: colors[i] for i, facility in enumerate(facilities)}
-
-        # Plot grids colored by facility
-        for facility in facilities:
-            facility_grids = grids[grids['assigned_facility'] == facility]
-            facility_grids.plot(
-                ax=ax1,
-                color=facility_colors[facility],
-                edgecolor='black',
-                linewidth=0.3,
-                alpha=0.7
-            )
+        colors = plt.cm.tab20(np.linspace(0, 1, len(facilities)))
+
+        # Plot all grids colored by facility in a single collection
+        assigned_grids.plot(
+            column='assigned_facility',
+            categorical=True,
+            cmap=ListedColormap(colors),
+            ax=ax1,
+            alpha=0.7,
+            rasterized=True,
+            **grid_edge_style(assigned_grids)
+        )
 
         # Plot facility locations
-        if 'assigned_facility_lat' in grids.columns:
-            facility_points = grids[['assigned_facility', 'assigned_facility_lat', 'assigned_facility_lon']].drop_duplicates()
-
-            for _, point in facility_points.iterrows():
-                ax1.scatter(
-                    point['assigned_facility_lon'],
-                    point['assigned_facility_lat'],
-                    c='red',
-                    s=200,
-                    marker='*',
-                    edgecolors='black',
-                    linewidths=2,
-                    zorder=5
-                )
-
-        # Create legend
+        if facility_points is not None:
+            ax1.scatter(
+                facility_points['x'].to_numpy(),
+                facility_points['y'].to_numpy(),
+                c='red',
+                s=200,
+                marker='*',
+                edgecolors='black',
+                linewidths=2,
+                zorder=5
+            )
+
+        # Create legend, listing the facilities serving the most grids in category order
+        grid_counts = np.bincount(
+            assigned_grids['assigned_facility'].cat.codes.to_numpy(), minlength=len(facilities)
+        )
+        listed = np.sort(np.argsort(-grid_counts, kind='stable')[:LEGEND_MAX_FACILITIES])
+
         legend_elements = [
-            mpatches.Patch(facecolor=facility_colors[f], edgecolor='black', label=f)
-            for f in facilities
+            mpatches.Patch(facecolor=colors[i], edgecolor='black', label=facilities[i])
+            for i in listed
         ]
         legend_elements.append(
             plt.Line2D([0], [0], marker='*', color='w', markerfacecolor='red',
                       markersize=15, markeredgecolor='black', label='Facility Location')
         )
 
-        ax1.legend(handles=legend_elements, loc='upper left', fontsize=8)
+        ax1.legend(handles=legend_elements, loc='upper left', fontsize=8,
+                   ncol=-(-len(legend_elements) // LEGEND_ROWS))
     else:
-        grids.plot(ax=ax1, color='lightgray', edgecolor='black', linewidth=0.3)
+        grids.plot(ax=ax1, color='lightgray', **grid_edge_style(grids))
 
     ax1.set_title(f'Facility Catchment Areas - {district_name}', fontsize=14, fontweight='bold')
-    ax1.set_xlabel('Longitude')
-    ax1.set_ylabel('Latitude')
+    ax1.set_xlabel(x_label)
+    ax1.set_ylabel(y_label)
     ax1.grid(True, alpha=0.3)
+    set_viewport(ax1, bbox)
 
     # MAP 2: Shaded by distance
-    if 'route_distance_km' in grids.columns:
-        grids.plot(
-            column='route_distance_km',
-            ax=ax2,
-            legend=True,
-            cmap='RdYlGn_r',  # Red (far) to Green (near)
-            edgecolor='black',
-            linewidth=0.3,
-            legend_kwds={
-                'label': 'Distance to nearest facility (km)',
-                'orientation': 'horizontal',
-                'pad': 0.05
-            }
+    if 'route_distance_km' in grids.columns and grids['route_distance_km'].notna().any():
+        plot_grid_values(
+            fig,
+            ax2,
+            grids,
+            'route_distance_km',
+            'RdYlGn_r',  # Red (far) to Green (near)
+            'Distance to nearest facility (km)',
+            vertices,
+            raster_cache
         )
 
         # Plot facility locations
-        if 'assigned_facility_lat' in grids.columns:
-            facility_points = grids[['assigned_facility_lat', 'assigned_facility_lon']].drop_duplicates()
+        if facility_points is not None:
             ax2.scatter(
-                facility_points['assigned_facility_lon'],
-                facility_points['assigned_facility_lat'],
+                facility_points['x'].to_numpy(),
+                facility_points['y'].to_numpy(),
                 c='red',
                 s=200,
                 marker='*',
@@ -117,13 +435,14 @@ def create_accessibility_map(grids_geojson, output_png, district_name, facility_
 
         ax2.legend(loc='upper left')
     else:
-        grids.plot(ax=ax2, color='lightgray', edgecolor='black', linewidth=0.3)
+        grids.plot(ax=ax2, color='lightgray', **grid_edge_style(grids))
 
     ax2.set_title(f'Travel Distance to Nearest {facility_type.capitalize()} - {district_name}',
                   fontsize=14, fontweight='bold')
-    ax2.set_xlabel('Longitude')
-    ax2.set_ylabel('Latitude')
+    ax2.set_xlabel(x_label)
+    ax2.set_ylabel(y_label)
     ax2.grid(True, alpha=0.3)
+    set_viewport(ax2, bbox)
 
     # Add overall title
     fig.suptitle(f'Spatial Access to {facility_type.capitalize()} - {district_name}',
@@ -132,27 +451,31 @@ def create_accessibility_map(grids_geojson, output_png, district_name, facility_
     plt.tight_layout()
 
     # Save
-    plt.savefig(output_png, dpi=300, bbox_inches='tight')
+    plt.savefig(output_png, dpi=dpi, bbox_inches='tight', pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL})
     print(f"Saved map to {output_png}")
 
-    plt.close()
+    # Release the figure and its artists before returning
+    plt.close(fig)
+    gc.collect()
 
 
-def create_population_map(grids_geojson, output_png, district_name):
+def create_population_map(grids, output_png, district_name, dpi=SAVE_DPI, vertices=None, bbox=None,
+                          raster_cache=None):
     """
     Create a map showing population distribution
 
     Args:
-        grids_geojson: Path to grids with population data
+        grids: GeoDataFrame with population data
         output_png: Output PNG file path
         district_name: Name of the district
+        dpi: Output resolution
+        vertices: Precomputed grid_polygon_vertices of the grids, if available
+        bbox: Optional (minx, miny, maxx, maxy) viewport to zoom the map to
+        raster_cache: Optional path prefix for cached rasterized images
     """
     print(f"Creating population map for {district_name}...")
 
-    # Load grids
-    grids = gpd.read_file(grids_geojson)
-
-    if 'population' not in grids.columns:
+    if 'population' not in grids.columns or not grids['population'].notna().any():
         print("Warning: No population data found")
         return
 
@@ -160,56 +483,106 @@ def create_population_map(grids_geojson, output_png, district_name):
     fig, ax = plt.subplots(figsize=(12, 10))
 
     # Plot population
-    grids.plot(
-        column='population',
-        ax=ax,
-        legend=True,
-        cmap='YlOrRd',
-        edgecolor='black',
-        linewidth=0.3,
-        legend_kwds={
-            'label': 'Population per grid',
-            'orientation': 'horizontal',
-            'pad': 0.05
-        }
-    )
+    plot_grid_values(fig, ax, grids, 'population', 'YlOrRd', 'Population per grid', vertices,
+                     raster_cache)
 
     ax.set_title(f'Population Distribution - {district_name}', fontsize=14, fontweight='bold')
-    ax.set_xlabel('Longitude')
-    ax.set_ylabel('Latitude')
+    x_label, y_label = axis_labels(grids.crs)
+    ax.set_xlabel(x_label)
+    ax.set_ylabel(y_label)
     ax.grid(True, alpha=0.3)
+    set_viewport(ax, bbox)
 
     plt.tight_layout()
-    plt.savefig(output_png, dpi=300, bbox_inches='tight')
+    plt.savefig(output_png, dpi=dpi, bbox_inches='tight', pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL})
     print(f"Saved population map to {output_png}")
 
-    plt.close()
+    # Release the figure and its artists before returning
+    plt.close(fig)
+    gc.collect()
 
 
 if __name__ == "__main__":
     if len(sys.argv) < 4:
-        print("Usage: python 06_create_visualization.py <grids_geojson> <district_name> <output_prefix> [facility_type]")
-        print("Example: python 06_create_visualization.py grids.geojson 'District A' output school")
+        print("Usage: python 06_create_visualization.py <grids_file> <district_name> <output_prefix> [facility_type] [dpi] [minx,miny,maxx,maxy]")
+        print("Example: python 06_create_visualization.py grids.parquet 'District A' output school 300 1.0,6.1,1.2,6.3")
         sys.exit(1)
 
     grids_file = sys.argv[1]
     district_name = sys.argv[2]
     output_prefix = sys.argv[3]
     facility_type = sys.argv[4] if len(sys.argv) > 4 else 'facility'
+    dpi = int(sys.argv[5]) if len(sys.argv) > 5 else SAVE_DPI
+    bbox = None
+    if len(sys.argv) > 6:
+        bbox = parse_viewport(sys.argv[6])
+        if bbox is None:
+            print(f"Error: viewport must be minx,miny,maxx,maxy with minx < maxx and miny < maxy, got '{sys.argv[6]}'")
+            sys.exit(1)
+
+    # Load grids once for both maps
+    grids = read_grids(grids_file, columns=MAP_COLUMNS)
+
+    # Facility names repeat across grids, so store them as categories
+    if 'assigned_facility' in grids.columns:
+        grids['assigned_facility'] = grids['assigned_facility'].astype('category')
+
+    # Only grids inside the requested viewport are drawn
+    if bbox is not None:
+        grids = cull_to_viewport(grids, bbox)
+        if grids.empty:
+            print(f"Error: no grids intersect the viewport {sys.argv[6]}")
+            sys.exit(1)
+
+    # Keep the parsed viewport for the raster cache key before it is reprojected
+    viewport = bbox
+    grids, bbox = project_to_utm(grids, bbox)
+    grids = simplify_for_display(grids, dpi)
+
+    # Extract polygon vertices once for both maps when fills are drawn as vectors
+    vertices = None
+    raster_cache = None
+    if len(grids) < RASTERIZE_MIN_GRIDS:
+        vertices = grid_polygon_vertices(grids.geometry.values)
+    elif os.environ.get('MAP_CACHE_DIR'):
+        # Rasterized fills depend on the input contents, viewport and dpi
+        cache_dir = os.environ['MAP_CACHE_DIR']
+        os.makedirs(cache_dir, exist_ok=True)
+        key = hashlib.sha1(f"{file_digest(grids_file)}:{viewport}:{dpi}".encode()).hexdigest()[:16]
+        raster_cache = os.path.join(cache_dir, key)
+
+    # Render both maps in parallel. Workers are forked after the grids are
+    # bound here, so only the small arguments below are pickled
+    _worker_data['grids'] = grids
+    _worker_data['vertices'] = vertices
+
+    with ProcessPoolExecutor(max_workers=2, mp_context=mp.get_context('fork')) as executor:
+        futures = [
+            # Create accessibility map
+            executor.submit(
+                _run_map,
+                create_accessibility_map,
+                f"{output_prefix}_accessibility.png",
+                district_name,
+                facility_type,
+                dpi,
+                bbox=bbox,
+                raster_cache=raster_cache
+            ),
+            # Create population map
+            executor.submit(
+                _run_map,
+                create_population_map,
+                f"{output_prefix}_population.png",
+                district_name,
+                dpi,
+                bbox=bbox,
+                raster_cache=raster_cache
+            )
+        ]
 
-    # Create accessibility map
-    create_accessibility_map(
-        grids_file,
-        f"{output_prefix}_accessibility.png",
-        district_name,
-        facility_type
-    )
-
-    # Create population map
-    create_population_map(
-        grids_file,
-        f"{output_prefix}_population.png",
-        district_name
-    )
+        # Propagate any error raised while rendering
+        for future in futures:
+            future.result()
 
     print("Visualization complete!")
\ No newline at end of file
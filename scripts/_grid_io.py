@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Read and write grid files, choosing GeoParquet or GeoJSON from the file suffix
+"""
+
+import json
+import geopandas as gpd
+import pyarrow.parquet as pq
+
+
+def is_parquet(path):
+    """Check whether a path refers to a GeoParquet file"""
+    return str(path).lower().endswith(('.parquet', '.geoparquet'))
+
+
+def read_grids(path, columns=None):
+    """
+    Read grids from GeoParquet or any OGR-readable vector file
+
+    Args:
+        path: Path to grids file
+        columns: Attribute columns to read (default all); names missing
+            from the file are skipped, geometry is always read
+
+    Returns:
+        GeoDataFrame with grids
+    """
+    if is_parquet(path):
+        if columns is not None:
+            schema = pq.read_schema(path)
+            geometry_column = json.loads(schema.metadata[b'geo'])['primary_column']
+            columns = [c for c in schema.names if c in columns or c == geometry_column]
+        return gpd.read_parquet(path, columns=columns)
+    return gpd.read_file(path, engine='pyogrio', use_arrow=True, columns=columns)
+
+
+def write_grids(grids, path):
+    """
+    Write grids as GeoParquet (.parquet) or GeoJSON (anything else)
+
+    Args:
+        grids: GeoDataFrame to write
+        path: Output file path
+    """
+    if is_parquet(path):
+        grids.to_parquet(path, compression='snappy')
+    else:
+        grids.to_file(path, driver='GeoJSON', engine='pyogrio')
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Numba kernel for converting WGS84 UTM coordinates to lat/long
+Uses the Krueger series to 6th order in n (as in PROJ's tmerc)
+"""
+
+import math
+import numpy as np
+from numba import njit, prange
+
+# WGS84 ellipsoid
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+
+# UTM projection constants
+UTM_K0 = 0.9996
+UTM_FALSE_EASTING = 500000.0
+UTM_FALSE_NORTHING_SOUTH = 10000000.0
+
+_n = WGS84_F / (2 - WGS84_F)
+
+# Rectifying radius
+_A = WGS84_A / (1 + _n) * (1 + _n**2 / 4 + _n**4 / 64 + _n**6 / 256)
+
+# Series coefficients from (xi, eta) to conformal (xi', eta')
+_BETA = np.array([
+    _n / 2 - 2 * _n**2 / 3 + 37 * _n**3 / 96 - _n**4 / 360 - 81 * _n**5 / 512 + 96199 * _n**6 / 604800,
+    _n**2 / 48 + _n**3 / 15 - 437 * _n**4 / 1440 + 46 * _n**5 / 105 - 1118711 * _n**6 / 3870720,
+    17 * _n**3 / 480 - 37 * _n**4 / 840 - 209 * _n**5 / 4480 + 5569 * _n**6 / 90720,
+    4397 * _n**4 / 161280 - 11 * _n**5 / 504 - 830251 * _n**6 / 7257600,
+    4583 * _n**5 / 161280 - 108847 * _n**6 / 3991680,
+    20648693 * _n**6 / 638668800,
+])
+
+# Series coefficients from conformal latitude to geodetic latitude
+_DELTA = np.array([
+    2 * _n - 2 * _n**2 / 3 - 2 * _n**3 + 116 * _n**4 / 45 + 26 * _n**5 / 45 - 2854 * _n**6 / 675,
+    7 * _n**2 / 3 - 8 * _n**3 / 5 - 227 * _n**4 / 45 + 2704 * _n**5 / 315 + 2323 * _n**6 / 945,
+    56 * _n**3 / 15 - 136 * _n**4 / 35 - 1262 * _n**5 / 105 + 73814 * _n**6 / 2835,
+    4279 * _n**4 / 630 - 332 * _n**5 / 35 - 399572 * _n**6 / 14175,
+    4174 * _n**5 / 315 - 144838 * _n**6 / 6237,
+    601676 * _n**6 / 22275,
+])
+
+
+def utm_zone(epsg):
+    """
+    Get the UTM zone for a WGS84 UTM EPSG code
+
+    Args:
+        epsg: EPSG code (326xx = north, 327xx = south)
+
+    Returns:
+        (zone, northern) tuple, or None if not a WGS84 UTM code
+    """
+    if 32601 <= epsg <= 32660:
+        return epsg - 32600, True
+    if 32701 <= epsg <= 32760:
+        return epsg - 32700, False
+    return None
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def utm_to_wgs84(easting, northing, zone, northern):
+    """
+    Convert UTM easting/northing to WGS84 longitude/latitude
+
+    Args:
+        easting: Array of eastings (m)
+        northing: Array of northings (m)
+        zone: UTM zone number (1-60)
+        northern: True for the northern hemisphere
+
+    Returns:
+        Arrays of longitudes and latitudes in degrees
+    """
+    n_points = easting.shape[0]
+    lon = np.empty(n_points)
+    lat = np.empty(n_points)
+
+    lon0 = math.radians(zone * 6 - 183)
+    false_northing = 0.0 if northern else UTM_FALSE_NORTHING_SOUTH
+    scale = UTM_K0 * _A
+
+    for i in prange(n_points):
+        xi = (northing[i] - false_northing) / scale
+        eta = (easting[i] - UTM_FALSE_EASTING) / scale
+
+        # Remove the ellipsoidal terms to get conformal sphere coordinates
+        xi_p = xi
+        eta_p = eta
+        for j in range(6):
+            k = 2.0 * (j + 1)
+            xi_p -= _BETA[j] * math.sin(k * xi) * math.cosh(k * eta)
+            eta_p -= _BETA[j] * math.cos(k * xi) * math.sinh(k * eta)
+
+        # Conformal latitude and longitude offset from the central meridian
+        chi = math.asin(math.sin(xi_p) / math.cosh(eta_p))
+        dlon = math.atan2(math.sinh(eta_p), math.cos(xi_p))
+
+        phi = chi
+        for j in range(6):
+            phi += _DELTA[j] * math.sin(2.0 * (j + 1) * chi)
+
+        lon[i] = math.degrees(lon0 + dlon)
+        lat[i] = math.degrees(phi)
+
+    return lon, lat
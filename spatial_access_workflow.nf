@@ -157,20 +157,22 @@ process splitDistricts {
 
     print(f"Found {len(districts)} districts")
 
+    # Get district name column (try common column names)
+    name_col = next(
+        (col for col in ['name', 'NAME', 'district', 'DISTRICT', 'District'] if col in districts.columns),
+        None
+    )
+    names = districts[name_col].astype(str).to_numpy() if name_col else [None] * len(districts)
+
     # Save each district as separate file
-    for idx, district in districts.iterrows():
-        # Get district name (try common column names)
-        district_name = None
-        for col in ['name', 'NAME', 'district', 'DISTRICT', 'District']:
-            if col in districts.columns:
-                district_name = str(district[col]).replace(' ', '_').replace('/', '_')
-                break
+    for idx, name in zip(districts.index, names):
+        district_name = name.replace(' ', '_').replace('/', '_') if name else None
 
         if not district_name:
             district_name = f'district_{idx}'
 
         # Create GeoDataFrame with single district
-        district_gdf = gpd.GeoDataFrame([district], geometry='geometry', crs=districts.crs)
+        district_gdf = districts.loc[[idx]]
 
         # Save as GeoJSON
         output_file = f"districts/{district_name}.geojson"
@@ -187,20 +189,20 @@ process splitDistricts {
 process generateGrids {
     container 'spatial-analysis:latest'
     tag "${district_file.baseName}"
-    publishDir "${params.outdir}/grids", mode: 'copy', pattern: "*_grids.geojson"
+    publishDir "${params.outdir}/grids", mode: 'copy', pattern: "*_grids.parquet"
 
     input:
     path district_file
     val hex_resolution
 
     output:
-    tuple val("${district_file.baseName}"), path("${district_file.baseName}_grids.geojson"), emit: grids
+    tuple val("${district_file.baseName}"), path("${district_file.baseName}_grids.parquet"), emit: grids
 
     script:
     """
     python /scripts/02_generate_grids.py \\
         ${district_file} \\
-        ${district_file.baseName}_grids.geojson \\
+        ${district_file.baseName}_grids.parquet \\
         ${hex_resolution}
     """
 }
@@ -218,14 +220,14 @@ process extractPopulation {
     path population_tif
 
     output:
-    tuple val(district_name), path("${district_name}_grids_pop.geojson"), emit: grids_with_pop
+    tuple val(district_name), path("${district_name}_grids_pop.parquet"), emit: grids_with_pop
 
     script:
     """
     python /scripts/03_extract_population.py \\
         ${grids_file} \\
         ${population_tif} \\
-        ${district_name}_grids_pop.geojson
+        ${district_name}_grids_pop.parquet
     """
 }
 
@@ -303,7 +305,7 @@ process filterFacilities {
 process calculateAccessibility {
     container 'spatial-analysis:latest'
     tag "${district_name}"
-    publishDir "${params.outdir}/grids", mode: 'copy', pattern: "*_accessibility.geojson"
+    publishDir "${params.outdir}/grids", mode: 'copy', pattern: "*_accessibility.parquet"
 
     input:
     tuple val(district_name), path(grids_file), path(facilities_file)
@@ -311,14 +313,14 @@ process calculateAccessibility {
     val osrm_port
 
     output:
-    tuple val(district_name), path("${district_name}_accessibility.geojson"), emit: results
+    tuple val(district_name), path("${district_name}_accessibility.parquet"), emit: results
 
     script:
     """
     python /scripts/04_calculate_accessibility.py \\
         ${grids_file} \\
         ${facilities_file} \\
-        ${district_name}_accessibility.geojson \\
+        ${district_name}_accessibility.parquet \\
         ${osrm_host} \\
         ${osrm_port}
     """